@@ -1,48 +1,292 @@
 import os
+import errno
+import ctypes
 import shutil
+import stat
+import re
 import argparse
 from datetime import datetime
 import hashlib
+import mmap
 import sys
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
 
-def get_file_hash(filepath, block_size=65536):
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Linux statx() constants, see <linux/stat.h> and <fcntl.h>
+AT_FDCWD = -100
+AT_SYMLINK_NOFOLLOW = 0x100
+AT_STATX_DONT_SYNC = 0x4000
+STATX_TYPE = 0x1
+STATX_MTIME = 0x40
+STATX_SIZE = 0x200
+
+class StatxTimestamp(ctypes.Structure):
+    _fields_ = [
+        ('tv_sec', ctypes.c_int64),
+        ('tv_nsec', ctypes.c_uint32),
+        ('reserved', ctypes.c_int32),
+    ]
+
+class Statx(ctypes.Structure):
+    _fields_ = [
+        ('stx_mask', ctypes.c_uint32),
+        ('stx_blksize', ctypes.c_uint32),
+        ('stx_attributes', ctypes.c_uint64),
+        ('stx_nlink', ctypes.c_uint32),
+        ('stx_uid', ctypes.c_uint32),
+        ('stx_gid', ctypes.c_uint32),
+        ('stx_mode', ctypes.c_uint16),
+        ('spare0', ctypes.c_uint16),
+        ('stx_ino', ctypes.c_uint64),
+        ('stx_size', ctypes.c_uint64),
+        ('stx_blocks', ctypes.c_uint64),
+        ('stx_attributes_mask', ctypes.c_uint64),
+        ('stx_atime', StatxTimestamp),
+        ('stx_btime', StatxTimestamp),
+        ('stx_ctime', StatxTimestamp),
+        ('stx_mtime', StatxTimestamp),
+        ('spare', ctypes.c_uint64 * 18),
+    ]
+
+def load_statx():
+    """
+    Returns the libc statx() function, or None if it isn't available.
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        statx = libc.statx
+    except (OSError, AttributeError):
+        return None
+    statx.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_uint, ctypes.POINTER(Statx)]
+    statx.restype = ctypes.c_int
+    return statx
+
+libc_statx = load_statx()
+
+def probe_file(path):
+    """
+    Returns (size, mtime_ns) for a path without following symlinks, or None
+    if the path does not exist (including when a parent is not a directory).
+
+    On Linux this uses statx() with AT_STATX_DONT_SYNC so that the answer can
+    come straight from the kernel's cache; elsewhere it falls back to os.lstat().
     """
-    Generates an MD5 hash of a file to check for identity.
+    global libc_statx
+    if libc_statx is not None:
+        buf = Statx()
+        wanted = STATX_TYPE | STATX_SIZE | STATX_MTIME
+        result = libc_statx(AT_FDCWD, os.fsencode(path), AT_SYMLINK_NOFOLLOW | AT_STATX_DONT_SYNC, wanted, ctypes.byref(buf))
+        if result == 0 and buf.stx_mask & wanted == wanted:
+            return buf.stx_size, buf.stx_mtime.tv_sec * 1_000_000_000 + buf.stx_mtime.tv_nsec
+        if result != 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return None
+            if err in (errno.ENOSYS, errno.EPERM):
+                # Kernel or sandbox without statx(), stop trying it
+                libc_statx = None
+            else:
+                raise OSError(err, os.strerror(err), path)
+
+    try:
+        st = os.lstat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return st.st_size, st.st_mtime_ns
+
+# Modification times within this many nanoseconds count as equal, like
+# rsync's --modify-window. Backup drives often store coarser timestamps than
+# the source (FAT keeps 2 seconds, exFAT 10 ms, NTFS 100 ns), so a copy's
+# mtime rarely matches the original's exactly.
+MTIME_TOLERANCE_NS = 2_000_000_000
+
+# Backup folders are named after their timestamp, '%Y-%m-%d_%H-%M-%S'
+BACKUP_NAME_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}_[0-9]{2}-[0-9]{2}-[0-9]{2}')
+
+# Written into a backup folder once it holds a complete snapshot of the source.
+# Dry runs and '--no-hardlink' incremental runs leave it out, so they are never
+# used as the base of a later incremental backup.
+SNAPSHOT_MARKER = '.backup_complete'
+
+def get_file_hash(filepath, block_size=1 << 20, legacy=False):
+    """
+    Generates a hash of a file to check for identity.
+
+    BLAKE3 is used when the blake3 package is installed, BLAKE2b otherwise;
+    pass legacy=True for the old MD5 digest.
     """
     try:
-        hasher = hashlib.md5()
-        with open(filepath, 'rb') as f:
-            buf = f.read(block_size)
-            while len(buf) > 0:
-                hasher.update(buf)
+        if blake3 is not None and not legacy:
+            # Memory-maps the file and hashes it with SIMD on multiple threads
+            hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+            hasher.update_mmap(filepath)
+            return hasher.hexdigest()
+
+        if legacy:
+            hasher = hashlib.md5()
+            with open(filepath, 'rb') as f:
                 buf = f.read(block_size)
-        return hasher.hexdigest()
+                while len(buf) > 0:
+                    hasher.update(buf)
+                    buf = f.read(block_size)
+            return hasher.hexdigest()
+
+        with open(filepath, 'rb', buffering=0) as f:
+            # Python 3.11+ streams the whole file through the hasher in C
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, 'blake2b').hexdigest()
+
+            hasher = hashlib.blake2b()
+            # mmap cannot map an empty file, so only map when there is data
+            if os.fstat(f.fileno()).st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hasher.update(mm)
+            return hasher.hexdigest()
     except Exception as e:
         print(f"Error: Could not read file to generate hash for '{filepath}': {e}", file=sys.stderr)
         return None
 
 def find_latest_backup(destination_dir):
     """
-    Finds the path to the most recent backup folder in the destination directory.
+    Finds the path to the most recent complete backup folder in the destination
+    directory. Folders without the snapshot marker are ignored.
     """
     backup_folders = []
     try:
-        for entry in os.listdir(destination_dir):
-            if os.path.isdir(os.path.join(destination_dir, entry)):
-                try:
-                    # Attempt to parse the timestamp from the folder name
-                    datetime.strptime(entry, '%Y-%m-%d_%H-%M-%S')
-                    backup_folders.append(entry)
-                except ValueError:
-                    # Not a timestamped backup folder, so we ignore it
-                    continue
-        backup_folders.sort(reverse=True)
-        return os.path.join(destination_dir, backup_folders[0]) if backup_folders else None
+        with os.scandir(destination_dir) as entries:
+            for entry in entries:
+                # is_dir() is answered from the directory listing itself on most
+                # filesystems, so no per-entry stat is needed
+                if entry.is_dir() and BACKUP_NAME_RE.fullmatch(entry.name):
+                    backup_folders.append(entry.name)
+        # The names are zero-padded and fixed-width, so the lexically largest is the newest
+        for name in sorted(backup_folders, reverse=True):
+            backup_folder = os.path.join(destination_dir, name)
+            if os.path.exists(os.path.join(backup_folder, SNAPSHOT_MARKER)):
+                return backup_folder
+        return None
     except Exception as e:
         print(f"Error: Could not find latest backup folder: {e}", file=sys.stderr)
         return None
 
-def run_backup(source_dir, destination_dir, full_backup, dry_run=False):
+def iter_source_files(root):
+    """
+    Recursively yields a DirEntry for every file under root.
+
+    Files in a directory are yielded before descending into its subdirectories,
+    and symlinked directories are not followed, mirroring os.walk().
+    """
+    subdirs = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    yield entry
+                elif not entry.is_symlink():
+                    subdirs.append(entry.path)
+    except OSError as e:
+        print(f"  > Error: Could not read directory '{root}': {e}. Skipping.", file=sys.stderr)
+        return
+
+    for path in subdirs:
+        yield from iter_source_files(path)
+
+# ioctl request to reflink one file into another on Btrfs/XFS, see <linux/fs.h>
+FICLONE = 0x40049409
+
+def zero_copy_file(source_file, destination_file):
+    """
+    Tries to copy a file without moving its bytes through Python, using the
+    platform's reflink or in-kernel copy facilities.
+
+    Returns True if the file was copied, or False if the caller should fall
+    back to a regular copy.
+    """
+    if sys.platform.startswith('linux'):
+        import fcntl
+        with open(source_file, 'rb') as fsrc, open(destination_file, 'wb') as fdst:
+            # A reflink shares the source's blocks, so nothing is copied at all
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return True
+            except OSError:
+                pass
+
+            if hasattr(os, 'copy_file_range'):
+                try:
+                    while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30) > 0:
+                        pass
+                    return True
+                except OSError:
+                    return False
+        return False
+
+    if sys.platform == 'darwin':
+        # clonefile() makes an APFS copy-on-write clone; the target must not exist
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            return libc.clonefile(os.fsencode(source_file), os.fsencode(destination_file), 0) == 0
+        except (OSError, AttributeError):
+            return False
+
+    if sys.platform == 'win32':
+        return bool(ctypes.windll.kernel32.CopyFileW(source_file, destination_file, False))
+
+    return False
+
+def copy_xattrs(source_file, destination_file):
+    """
+    Copies extended attributes, ignoring filesystems that don't support them,
+    the same way shutil.copystat() does.
+    """
+    if not hasattr(os, 'listxattr'):
+        return
+    try:
+        names = os.listxattr(source_file)
+    except OSError as e:
+        if e.errno not in (errno.ENOTSUP, errno.ENODATA, errno.EINVAL):
+            raise
+        return
+    for name in names:
+        try:
+            os.setxattr(destination_file, name, os.getxattr(source_file, name))
+        except OSError as e:
+            if e.errno not in (errno.EPERM, errno.ENOTSUP, errno.ENODATA, errno.EINVAL):
+                raise
+
+def copy_file(source_file, destination_file, source_stat):
+    """
+    Copies a file's contents, then restores its extended attributes,
+    permissions, timestamps and flags, taking the metadata from an
+    already-fetched stat result instead of stat'ing the source again.
+    """
+    # Only regular files take the zero-copy path: opening e.g. a FIFO would
+    # block forever, while shutil.copyfile() rejects it with SpecialFileError
+    if not (stat.S_ISREG(source_stat.st_mode) and zero_copy_file(source_file, destination_file)):
+        shutil.copyfile(source_file, destination_file)
+    copy_xattrs(source_file, destination_file)
+    os.chmod(destination_file, stat.S_IMODE(source_stat.st_mode))
+    os.utime(destination_file, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    # Set flags last, as e.g. an immutable flag would block the calls above
+    if hasattr(os, 'chflags') and getattr(source_stat, 'st_flags', 0):
+        try:
+            os.chflags(destination_file, source_stat.st_flags)
+        except OSError as e:
+            if e.errno not in (errno.ENOTSUP, errno.EOPNOTSUPP):
+                raise
+
+def run_backup(source_dir, destination_dir, full_backup, dry_run=False, verify_hash=False, hardlink=True, legacy_hash=False):
     """
     Copies files from a source to a destination folder, with options for
     incremental or full backups.
@@ -53,6 +297,12 @@ def run_backup(source_dir, destination_dir, full_backup, dry_run=False):
         full_backup (bool): If True, performs a full backup. If False,
                             performs an incremental backup.
         dry_run (bool): If True, simulates the backup without moving files.
+        verify_hash (bool): If True, files whose size and modification time
+                            match the latest backup are also compared by hash.
+        hardlink (bool): If True, unchanged files in an incremental backup are
+                         hard-linked to the latest backup instead of left out.
+        legacy_hash (bool): If True, verify_hash compares MD5 digests instead
+                            of BLAKE3/BLAKE2b ones.
     """
     # 1. Validate source and destination paths
     if not os.path.isdir(source_dir):
@@ -73,99 +323,213 @@ def run_backup(source_dir, destination_dir, full_backup, dry_run=False):
     
     print(f"Starting {'FULL' if full_backup else 'INCREMENTAL'} backup from '{source_dir}'...")
 
-    # Create a log list to store actions
-    log_messages = []
+    # Look up the previous backup before the new folder exists, otherwise
+    # the new (empty) folder would be picked as the latest one
+    previous_backup_dir = None if full_backup else find_latest_backup(destination_dir)
     
-    # Create the destination directory if it doesn't exist
+    # Create the backup directory. It must be new: files in it may end up
+    # hard-linked to older backups, so reusing a folder from a run started in
+    # the same second would write through those links into the older backups.
     try:
-        os.makedirs(backup_path, exist_ok=True)
-        log_messages.append(f"Created new backup directory: '{backup_path}'")
+        os.mkdir(backup_path)
+    except FileExistsError:
+        print(f"Error: Backup folder '{backup_path}' already exists. Wait a second and try again.", file=sys.stderr)
+        return
     except OSError as e:
         print(f"Error: Failed to create destination directory '{backup_path}': {e}", file=sys.stderr)
         return
-    
-    # For incremental backup, find the latest backup folder to compare against
-    latest_backup_dir = None
-    if not full_backup:
-        latest_backup_dir = find_latest_backup(destination_dir)
-        if latest_backup_dir:
-            print(f"  > Comparing to latest backup at: '{latest_backup_dir}'")
-            log_messages.append(f"Performing incremental backup against: '{latest_backup_dir}'")
-        else:
-            print("  > No previous backups found. Performing a full backup instead.")
-            log_messages.append("No previous backups found. Performing a full backup.")
-
-    # 3. Iterate through files and copy them
+
+    # Open the log file up front and write each action as it happens,
+    # rather than holding every message in memory until the end
+    try:
+        log_file = open(log_file_path, 'w', encoding='utf-8', buffering=1 << 20)
+    except OSError as e:
+        print(f"Error: Could not create backup log file '{log_file_path}': {e}", file=sys.stderr)
+        return
+
     files_to_copy = 0
     files_skipped = 0
     total_files = 0
+    
+    try:
+        log_file.write(f"Backup Log: {timestamp}\n")
+        log_file.write(f"Source: {source_dir}\n")
+        log_file.write(f"Destination: {destination_dir}\n")
+        log_file.write(f"Backup Type: {'Full' if full_backup else 'Incremental'}\n")
+        log_file.write(f"Dry Run: {'Yes' if dry_run else 'No'}\n\n")
+        log_file.write("--- Actions ---\n")
+        log_file.write(f"Created new backup directory: '{backup_path}'\n")
+
+        # For incremental backup, find the latest backup folder to compare against
+        latest_backup_dir = None
+        latest_prefix = None
+        if not full_backup:
+            latest_backup_dir = previous_backup_dir
+            if latest_backup_dir:
+                latest_prefix = os.path.join(os.path.abspath(latest_backup_dir), '')
+                print(f"  > Comparing to latest backup at: '{latest_backup_dir}'")
+                log_file.write(f"Performing incremental backup against: '{latest_backup_dir}'\n")
+            else:
+                print("  > No previous backups found. Performing a full backup instead.")
+                log_file.write("No previous backups found. Performing a full backup.\n")
+
+        def backup_file(source_file, destination_file, relative_path, source_stat):
+            """
+            Backs up a single file. Runs on a worker thread, so instead of printing
+            it returns the outcome ('copied' or 'skipped') and a list of
+            (console message, log message, is error) events for the main thread.
+            """
+            events = []
 
-    for root, _, files in os.walk(source_dir):
-        for filename in files:
-            total_files += 1
-            source_file = os.path.join(root, filename)
-            relative_path = os.path.relpath(source_file, source_dir)
-            destination_file = os.path.join(backup_path, relative_path)
-            
             # Check if file already exists in the latest backup for incremental mode
             if not full_backup and latest_backup_dir:
-                latest_backup_file = os.path.join(latest_backup_dir, relative_path)
-                if os.path.exists(latest_backup_file):
-                    # Check if files are identical
-                    try:
-                        if os.path.getsize(source_file) == os.path.getsize(latest_backup_file):
-                            print(f"  > Skipping identical file: '{relative_path}'")
-                            log_messages.append(f"Skipped identical file: '{relative_path}'")
-                            files_skipped += 1
-                            continue # Skip the copy operation
-                        else:
-                            print(f"  > Found updated file: '{relative_path}'")
-                            log_messages.append(f"Found updated file: '{relative_path}'")
-                    except OSError as e:
-                        print(f"Error checking file size for '{relative_path}': {e}. Copying anyway.", file=sys.stderr)
-            
-            # Create subdirectories in the destination if they don't exist
-            os.makedirs(os.path.dirname(destination_file), exist_ok=True)
+                latest_backup_file = latest_prefix + relative_path
+                try:
+                    latest_fingerprint = probe_file(latest_backup_file)
+                except OSError as e:
+                    latest_fingerprint = None
+                    events.append((f"Error checking file '{relative_path}' in latest backup: {e}. Copying anyway.", None, True))
+
+                if latest_fingerprint is not None:
+                    # Size and modification time act as the file's fingerprint;
+                    # the contents are only hashed when explicitly requested
+                    latest_size, latest_mtime_ns = latest_fingerprint
+                    identical = (source_stat.st_size == latest_size
+                                 and abs(source_stat.st_mtime_ns - latest_mtime_ns) <= MTIME_TOLERANCE_NS)
+                    if identical and verify_hash:
+                        source_hash = get_file_hash(source_file, legacy=legacy_hash)
+                        identical = source_hash is not None and source_hash == get_file_hash(latest_backup_file, legacy=legacy_hash)
+
+                    if identical:
+                        if dry_run or not hardlink:
+                            events.append((f"  > Skipping identical file: '{relative_path}'", f"Skipped identical file: '{relative_path}'", False))
+                            return 'skipped', events # Skip the copy operation
+
+                        # Hard-link the unchanged file to the latest backup's copy, so every
+                        # backup folder is complete on its own without using more space
+                        try:
+                            os.link(latest_backup_file, destination_file)
+                            events.append((f"  > Linked identical file: '{relative_path}'", f"Linked identical file: '{relative_path}'", False))
+                        except OSError as e:
+                            # e.g. the destination filesystem doesn't support hard links
+                            try:
+                                copy_file(source_file, destination_file, source_stat)
+                                events.append((f"  > Could not link identical file '{relative_path}' ({e}). Copied it instead.", f"Copied identical file (link failed): '{relative_path}'", False))
+                            except Exception as e:
+                                events.append((f"  > Error: Could not link or copy identical file '{relative_path}': {e}", f"Unexpected error. Skipped: '{relative_path}' due to error: {e}", True))
+                        return 'skipped', events
+                    else:
+                        events.append((f"  > Found updated file: '{relative_path}'", f"Found updated file: '{relative_path}'", False))
 
             # Copy the file
             if not dry_run:
                 try:
-                    shutil.copy2(source_file, destination_file)
-                    print(f"  > Copied '{relative_path}'")
-                    log_messages.append(f"Copied: '{relative_path}'")
-                    files_to_copy += 1
+                    copy_file(source_file, destination_file, source_stat)
+                    events.append((f"  > Copied '{relative_path}'", f"Copied: '{relative_path}'", False))
+                    return 'copied', events
                 except shutil.SameFileError:
-                    print(f"  > Warning: File '{relative_path}' is already in destination.", file=sys.stderr)
-                    log_messages.append(f"Warning: Skipped '{relative_path}' because it already exists in the destination.")
-                    files_skipped += 1
+                    events.append((f"  > Warning: File '{relative_path}' is already in destination.", f"Warning: Skipped '{relative_path}' because it already exists in the destination.", True))
                 except PermissionError as e:
-                    print(f"  > Error: Permission denied for '{relative_path}'. Skipping.", file=sys.stderr)
-                    log_messages.append(f"Permission denied. Skipped: '{relative_path}'")
-                    files_skipped += 1
+                    events.append((f"  > Error: Permission denied for '{relative_path}'. Skipping.", f"Permission denied. Skipped: '{relative_path}'", True))
                 except Exception as e:
-                    print(f"  > Unexpected error copying '{relative_path}': {e}", file=sys.stderr)
-                    log_messages.append(f"Unexpected error. Skipped: '{relative_path}' due to error: {e}")
-                    files_skipped += 1
+                    events.append((f"  > Unexpected error copying '{relative_path}': {e}", f"Unexpected error. Skipped: '{relative_path}' due to error: {e}", True))
+                return 'skipped', events
             else:
-                print(f"  > (Dry Run) Would copy '{relative_path}'")
-                log_messages.append(f"(Dry Run) Would copy: '{relative_path}'")
-                files_to_copy += 1
+                events.append((f"  > (Dry Run) Would copy '{relative_path}'", f"(Dry Run) Would copy: '{relative_path}'", False))
+                return 'copied', events
 
-    # Write the log file
-    try:
-        with open(log_file_path, 'w', encoding='utf-8') as log_file:
-            log_file.write(f"Backup Log: {timestamp}\n")
-            log_file.write(f"Source: {source_dir}\n")
-            log_file.write(f"Destination: {destination_dir}\n")
-            log_file.write(f"Backup Type: {'Full' if full_backup else 'Incremental'}\n")
-            log_file.write(f"Dry Run: {'Yes' if dry_run else 'No'}\n\n")
-            log_file.write("--- Actions ---\n")
-            for message in log_messages:
-                log_file.write(message + '\n')
-        print(f"\nBackup log saved to '{log_file_path}'")
-    except Exception as e:
+        # 3. Collect the files to back up
+        tasks = []
+        relative_dirs = set()
+
+        # The source and destination roots are fixed for the whole run, so paths
+        # are built by slicing and concatenating instead of os.path.relpath/join.
+        # Joining with '' guarantees exactly one trailing separator.
+        source_root = os.path.join(os.path.abspath(source_dir), '')
+        source_prefix_len = len(source_root)
+        destination_prefix = os.path.join(os.path.abspath(backup_path), '')
+
+        for entry in iter_source_files(source_root):
+            total_files += 1
+            relative_path = entry.path[source_prefix_len:]
+            try:
+                # DirEntry caches the result, so the source is only stat'ed once
+                source_stat = entry.stat()
+            except OSError as e:
+                print(f"  > Error: Could not read '{relative_path}': {e}. Skipping.", file=sys.stderr)
+                log_file.write(f"Could not read. Skipped: '{relative_path}' due to error: {e}\n")
+                files_skipped += 1
+                continue
+            tasks.append((entry.path, destination_prefix + relative_path, relative_path, source_stat))
+            relative_dirs.add(os.path.dirname(relative_path))
+
+        # Create each destination subdirectory once up front, parents first,
+        # rather than calling makedirs for every file
+        for relative_dir in sorted(relative_dirs):
+            if relative_dir:
+                try:
+                    os.makedirs(destination_prefix + relative_dir, exist_ok=True)
+                except OSError as e:
+                    print(f"  > Error: Failed to create directory '{relative_dir}': {e}", file=sys.stderr)
+                    log_file.write(f"Failed to create directory: '{relative_dir}' due to error: {e}\n")
+
+        # 4. Copy them in parallel. Hashing and copying release the GIL, so
+        # threads overlap the I/O. Results are reported from this thread only.
+        # Only a bounded window of tasks is in flight at once, and each future is
+        # dropped once reported, so finished results don't pile up in memory.
+        max_workers = (os.cpu_count() or 1) * 2
+        pending_tasks = iter(tasks)
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                for task in islice(pending_tasks, max_workers * 4 - len(in_flight)):
+                    in_flight.add(executor.submit(backup_file, *task))
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        outcome, events = future.result()
+                    except Exception as e:
+                        print(f"  > Unexpected error during backup: {e}", file=sys.stderr)
+                        log_file.write(f"Unexpected error during backup: {e}\n")
+                        files_skipped += 1
+                        continue
+
+                    for message, log_message, is_error in events:
+                        print(message, file=sys.stderr if is_error else sys.stdout)
+                        if log_message:
+                            log_file.write(log_message + '\n')
+                    if outcome == 'copied':
+                        files_to_copy += 1
+                    else:
+                        files_skipped += 1
+
+        # 5. Mark the folder as a complete snapshot. A full backup always is one;
+        # an incremental one only if unchanged files were linked into it.
+        if not dry_run and (latest_backup_dir is None or hardlink):
+            try:
+                # 'x' so a source file of the same name, possibly hard-linked to
+                # an older backup, is never written through
+                with open(os.path.join(backup_path, SNAPSHOT_MARKER), 'x'):
+                    pass
+            except OSError as e:
+                print(f"  > Warning: Could not mark backup as complete: {e}", file=sys.stderr)
+                log_file.write(f"Could not mark backup as complete: {e}\n")
+
+        # The log is buffered, so write errors may only surface when it is
+        # flushed; close it here so they are reported like any other
+        log_file.close()
+    except OSError as e:
         print(f"\nError: Could not write backup log file: {e}", file=sys.stderr)
-    
+    else:
+        print(f"\nBackup log saved to '{log_file_path}'")
+    finally:
+        try:
+            log_file.close()
+        except OSError:
+            pass # Already reported above
+
     # Print the summary
     print("\n--- Backup Summary ---")
     print(f"Total files in source: {total_files}")
@@ -201,6 +565,21 @@ if __name__ == "__main__":
         action="store_true",
         help="Simulates the backup process without actually copying or deleting any files."
     )
+    parser.add_argument(
+        "--verify-hash",
+        action="store_true",
+        help="In incremental mode, also compare file hashes when size and modification time match."
+    )
+    parser.add_argument(
+        "--legacy-hash",
+        action="store_true",
+        help="Use MD5 instead of BLAKE3/BLAKE2b when comparing file hashes with --verify-hash."
+    )
+    parser.add_argument(
+        "--no-hardlink",
+        action="store_true",
+        help="In incremental mode, leave unchanged files out of the new backup instead of hard-linking them to the latest one."
+    )
     
     args = parser.parse_args()
 
@@ -211,4 +590,4 @@ if __name__ == "__main__":
     elif not args.incremental and not args.full:
         is_full_backup = False
 
-    run_backup(args.source_dir, args.destination_dir, is_full_backup, args.dry_run)
+    run_backup(args.source_dir, args.destination_dir, is_full_backup, args.dry_run, args.verify_hash, not args.no_hardlink, args.legacy_hash)
@@ -1,9 +1,71 @@
 import os
 import sys
+import csv
+import codecs
 import argparse
 import pandas as pd
 from collections import Counter
 
+# How much of the file is read up front to detect its encoding and delimiter
+SAMPLE_SIZE = 64 * 1024
+
+# A list of common encodings to try, in order
+ENCODINGS = ['utf-8', 'latin1', 'utf-16']
+
+def detect_encoding(sample):
+    """
+    Returns the first encoding that can decode the sample, along with the
+    decoded text, or (None, None) if none of them can.
+    """
+    for encoding in ENCODINGS:
+        try:
+            # An incremental decoder tolerates a multi-byte character cut off
+            # at the end of the sample
+            text = codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding, text
+        except UnicodeDecodeError:
+            print(f"  > '{encoding}' encoding failed. Trying next...")
+            continue # Try the next encoding in the list
+    return None, None
+
+def detect_delimiter(text):
+    """
+    Guesses the delimiter from a sample of the file, defaulting to a comma.
+    """
+    try:
+        return csv.Sniffer().sniff(text, delimiters=',;\t|').delimiter
+    except csv.Error:
+        return ','
+
+def read_csv(filepath, delimiter, encoding):
+    """
+    Reads a CSV file with pandas' multithreaded PyArrow engine, falling back to
+    the C engine when pyarrow isn't installed or the header has duplicates.
+    """
+    try:
+        df = pd.read_csv(filepath, delimiter=delimiter, encoding=encoding, engine='pyarrow')
+    except ImportError:
+        return pd.read_csv(filepath, delimiter=delimiter, encoding=encoding, engine='c')
+
+    # Unlike the C engine, PyArrow doesn't rename duplicate columns to 'a.1', ...
+    if df.columns.duplicated().any():
+        return pd.read_csv(filepath, delimiter=delimiter, encoding=encoding, engine='c')
+    return df
+
+def has_binary_columns(df):
+    """
+    Checks whether any column was read as raw bytes. PyArrow does this instead
+    of raising UnicodeDecodeError when the file doesn't match the encoding.
+    """
+    if any(isinstance(col, bytes) for col in df.columns):
+        return True
+    for col in df.columns[(df.dtypes == object).to_numpy()]:
+        values = df[col].dropna()
+        # A column is either decoded or binary as a whole, so one value is enough
+        if not values.empty and isinstance(values.iloc[0], bytes):
+            return True
+    return False
+
 def process_csv(filepath, output_path=None, delimiter=None):
     """
     Reads and analyzes a single CSV file, calculating statistics and reporting on its content.
@@ -12,48 +74,47 @@ def process_csv(filepath, output_path=None, delimiter=None):
         filepath (str): The path to the CSV file.
         output_path (str, optional): The path to export the summary to. Defaults to None.
         delimiter (str, optional): The delimiter to use for parsing the CSV. If None,
-                                   pandas will try to detect it automatically.
+                                   it is detected from the start of the file.
     """
     print(f"\n--- Processing '{filepath}' ---")
     try:
-        # A list of common encodings to try
-        encodings_to_try = ['utf-8', 'latin1', 'utf-16']
-        df = None
+        # Read the start of the file once to detect both encoding and delimiter
+        with open(filepath, 'rb') as file:
+            sample = file.read(SAMPLE_SIZE)
+
+        if not sample.strip():
+            print("  > Warning: File is empty.")
+            return
+
+        encoding, sample_text = detect_encoding(sample)
+        if encoding is None:
+            print("Error: Could not read file with any tested encoding.")
+            return
 
-        # Loop through the encodings to find one that works
-        for encoding in encodings_to_try:
+        if delimiter is None:
+            delimiter = detect_delimiter(sample_text)
+            print(f"  > Delimiter detected as '{delimiter}'.")
+
+        # The sample only covers the start of the file, so the encoding can
+        # still turn out to be wrong once the whole file is read
+        df = None
+        for encoding in ENCODINGS[ENCODINGS.index(encoding):]:
             try:
-                df = pd.read_csv(filepath, delimiter=delimiter, encoding=encoding)
-                print(f"  > File successfully read with '{encoding}' encoding.")
-                break # Exit the loop if the read is successful
+                df = read_csv(filepath, delimiter, encoding)
             except UnicodeDecodeError:
-                print(f"  > '{encoding}' encoding failed. Trying next...")
-                continue # Try the next encoding in the list
-            except pd.errors.ParserError:
-                # If pandas can't parse it with a given delimiter, we'll try to autodetect later.
-                # Just continue to the next encoding for now.
-                continue
-
-        # Check if a DataFrame was successfully created
+                df = None
+            if df is not None and not has_binary_columns(df):
+                print(f"  > File successfully read with '{encoding}' encoding.")
+                break
+            print(f"  > '{encoding}' encoding failed. Trying next...")
+            df = None
+
         if df is None:
             print("Error: Could not read file with any tested encoding.")
             return
 
-        # If no delimiter was specified, try to detect it
-        if delimiter is None and df.shape[1] == 1:
-            print("  > Auto-detection failed. Trying common delimiters...")
-            try_delimiters = [';', '\t', '|']
-            for d in try_delimiters:
-                try:
-                    df = pd.read_csv(filepath, delimiter=d)
-                    if df.shape[1] > 1:
-                        print(f"  > Delimiter detected as '{d}'.")
-                        break
-                except Exception:
-                    continue # Skip if the delimiter causes another error
-
-        if df is None or df.empty:
-            print("  > Warning: File is empty or could not be parsed with common delimiters.")
+        if df.empty:
+            print("  > Warning: File is empty or could not be parsed.")
             return
 
         # 1. Shows basic info (rows, columns)
@@ -61,67 +122,46 @@ def process_csv(filepath, output_path=None, delimiter=None):
         print(f"  > Total Rows: {num_rows}")
         print(f"  > Total Columns: {num_cols}")
 
-        # Summary data structure
-        summary = {
-            'Column': [],
-            'Data Type': [],
-            'Missing Values': [],
-            'Stats': []
-        }
-
         # 4. Detects and reports missing values
-        missing_values = df.isnull().sum()
+        missing_values = df.isna().sum()
 
         # 2. Calculates statistics for numeric columns
         # 3. Shows unique values count for text columns
-        for col in df.columns:
-            column_data = df[col]
-            missing_count = missing_values[col]
-
-            summary['Column'].append(col)
-            summary['Missing Values'].append(f"{missing_count} ({missing_count/num_rows:.2%})")
-
-            # Check if the column is numeric
-            if pd.api.types.is_numeric_dtype(column_data):
-                summary['Data Type'].append('Numeric')
-                stats = {
-                    'mean': column_data.mean(),
-                    'min': column_data.min(),
-                    'max': column_data.max()
-                }
-                summary['Stats'].append(stats)
-            # Otherwise, it's a text/categorical column
-            else:
-                summary['Data Type'].append('Text')
-                unique_count = column_data.nunique()
-                stats = {
-                    'unique_count': unique_count
-                }
-                summary['Stats'].append(stats)
-        
+        # Every statistic is computed for all columns at once, and the summary
+        # is built as one DataFrame with a row per column of the input
+        numeric_columns = df.select_dtypes('number').columns
+        is_numeric = pd.Series(df.columns.isin(numeric_columns), index=df.columns)
+        numeric_df = df[numeric_columns]
+        text_df = df.drop(columns=numeric_columns)
+
+        summary_df = pd.DataFrame({
+            'Data Type': is_numeric.map({True: 'Numeric', False: 'Text'}),
+            'Missing Values': missing_values,
+            'Missing %': (missing_values / num_rows * 100).round(2),
+            'Mean': numeric_df.mean().reindex(df.columns),
+            'Min': numeric_df.min().reindex(df.columns),
+            'Max': numeric_df.max().reindex(df.columns),
+            'Unique Values': text_df.nunique().reindex(df.columns).astype('Int64'),
+        })
+        summary_df.index.name = 'Column'
+
         # Display the formatted summary
         print("\n  > Column-wise Summary:")
         print("    " + "="*70)
-        for i, col in enumerate(summary['Column']):
-            data_type = summary['Data Type'][i]
-            missing_str = summary['Missing Values'][i]
-            stats = summary['Stats'][i]
-
+        for col, row in summary_df.iterrows():
             print(f"    - Column: '{col}'")
-            print(f"      - Data Type: {data_type}")
-            print(f"      - Missing: {missing_str}")
-            if data_type == 'Numeric':
-                print(f"      - Mean: {stats['mean']:.2f}, Min: {stats['min']:.2f}, Max: {stats['max']:.2f}")
+            print(f"      - Data Type: {row['Data Type']}")
+            print(f"      - Missing: {row['Missing Values']} ({row['Missing Values']/num_rows:.2%})")
+            if row['Data Type'] == 'Numeric':
+                print(f"      - Mean: {row['Mean']:.2f}, Min: {row['Min']:.2f}, Max: {row['Max']:.2f}")
             else:
-                print(f"      - Unique Values: {stats['unique_count']}")
+                print(f"      - Unique Values: {row['Unique Values']}")
             print("    " + "-"*70)
 
         # 5. Can export summary to a new CSV file
         if output_path:
-            summary_df = pd.DataFrame(summary)
-            summary_df['Stats'] = summary_df['Stats'].astype(str) # Convert dict to string for CSV
             try:
-                summary_df.to_csv(output_path, index=False)
+                summary_df.to_csv(output_path)
                 print(f"\n  > Summary successfully exported to '{output_path}'")
             except Exception as e:
                 print(f"  > Error exporting summary to '{output_path}': {e}")
@@ -149,7 +189,7 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "-d", "--delimiter",
-        help="Specify the delimiter (e.g., ',' or ';'). If not specified, pandas will attempt to detect it."
+        help="Specify the delimiter (e.g., ',' or ';'). If not specified, it is detected from the start of the file."
     )
 
     args = parser.parse_args()
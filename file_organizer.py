@@ -1,7 +1,58 @@
 import os
+import errno
+import ctypes
 import shutil
 import argparse
 import sys
+from collections import defaultdict
+
+# Linux renameat2() constants, see <fcntl.h> and <linux/fs.h>
+AT_FDCWD = -100
+RENAME_NOREPLACE = 1
+
+def load_renameat2():
+    """
+    Returns the libc renameat2() function, or None if it isn't available.
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        renameat2 = libc.renameat2
+    except (OSError, AttributeError):
+        return None
+    renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    renameat2.restype = ctypes.c_int
+    return renameat2
+
+libc_renameat2 = load_renameat2()
+
+def move_file(source_path, destination_path):
+    """
+    Moves a file with a single rename where possible.
+
+    On Linux, renameat2(RENAME_NOREPLACE) refuses to overwrite an existing
+    file and raises FileExistsError instead. Elsewhere os.replace() is used.
+    Only a move across filesystems falls back to the slower shutil.move().
+    """
+    global libc_renameat2
+    try:
+        if libc_renameat2 is not None:
+            result = libc_renameat2(AT_FDCWD, os.fsencode(source_path), AT_FDCWD, os.fsencode(destination_path), RENAME_NOREPLACE)
+            if result == 0:
+                return
+            err = ctypes.get_errno()
+            if err not in (errno.ENOSYS, errno.EINVAL, errno.EPERM):
+                raise OSError(err, os.strerror(err), source_path, None, destination_path)
+            if err == errno.ENOSYS:
+                # Kernel without renameat2(), stop trying it
+                libc_renameat2 = None
+            # Otherwise the filesystem doesn't support RENAME_NOREPLACE
+        os.replace(source_path, destination_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(source_path, destination_path)
 
 def organize_files(folder_path, dry_run=False):
     """
@@ -21,57 +72,70 @@ def organize_files(folder_path, dry_run=False):
     if dry_run:
         print("\n*** This is a DRY RUN. No files will be moved. ***\n")
 
-    # Get a list of all items in the folder
+    file_count = 0
+    move_count = 0
+
+    # Group the files by extension first, so that each destination folder
+    # is checked and created once rather than once per file
+    files_by_extension = defaultdict(list)
+
+    # Iterate over all items in the directory. scandir() already knows each
+    # entry's type from the directory listing, so no extra stat is needed.
     try:
-        all_items = os.listdir(folder_path)
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                # Check if the item is a regular file (not a folder or symlink)
+                if entry.is_file(follow_symlinks=False):
+                    file_count += 1
+                    # Get the file extension and convert to lowercase for consistency.
+                    # Like os.path.splitext, leading dots (e.g. '.bashrc') don't
+                    # start an extension.
+                    stem, _, file_extension = entry.name.rpartition('.')
+                    if not stem.lstrip('.'):
+                        file_extension = ''
+                    file_extension = file_extension.lower()
+
+                    # If there is no extension (e.g., a file named 'README'), use a special folder
+                    if not file_extension:
+                        file_extension = "no_extension"
+
+                    files_by_extension[file_extension].append(entry)
     except PermissionError:
         print(f"Error: Permission denied to access folder '{folder_path}'.")
         sys.exit(1)
     except Exception as e:
         print(f"An unexpected error occurred while listing files: {e}")
         sys.exit(1)
-        
-    file_count = 0
-    move_count = 0
-
-    # Iterate over all items in the directory
-    for item in all_items:
-        item_path = os.path.join(folder_path, item)
 
-        # Check if the item is a file (and not a folder)
-        if os.path.isfile(item_path):
-            file_count += 1
-            # Get the file extension and convert to lowercase for consistency
-            _, file_extension = os.path.splitext(item)
-            file_extension = file_extension.lower().strip('.')
+    # Local name for the move function, looked up once instead of per file
+    move = move_file
 
-            # If there is no extension (e.g., a file named 'README'), use a special folder
-            if not file_extension:
-                file_extension = "no_extension"
+    for file_extension, entries in files_by_extension.items():
+        # Create the destination folder path. Files are moved to
+        # destination_prefix + name, so no per-file path joining is needed.
+        destination_folder = os.path.join(folder_path, file_extension)
+        destination_prefix = os.path.join(destination_folder, '')
 
-            # Create the destination folder path
-            destination_folder = os.path.join(folder_path, file_extension)
-
-            # Check if the destination folder exists. If not, create it.
-            if not os.path.exists(destination_folder):
-                try:
-                    os.makedirs(destination_folder)
-                    print(f"  > Created folder: '{file_extension}'")
-                except OSError as e:
-                    print(f"  > Error creating folder '{file_extension}': {e}. Skipping file '{item}'.")
-                    continue
+        # Check if the destination folder exists. If not, create it.
+        if not os.path.exists(destination_folder):
+            try:
+                os.makedirs(destination_folder)
+                print(f"  > Created folder: '{file_extension}'")
+            except OSError as e:
+                print(f"  > Error creating folder '{file_extension}': {e}. Skipping {len(entries)} file(s).")
+                continue
 
-            # Define the new path for the file
-            destination_path = os.path.join(destination_folder, item)
+        for entry in entries:
+            item = entry.name
 
             # Move the file unless it's a dry run
             if not dry_run:
                 try:
-                    shutil.move(item_path, destination_path)
+                    move(entry.path, destination_prefix + item)
                     move_count += 1
                     print(f"  > Moved '{item}' -> '{file_extension}/'")
-                except shutil.SameFileError:
-                    print(f"  > Warning: File '{item}' is already in its correct folder. Skipping.")
+                except FileExistsError:
+                    print(f"  > Warning: A file named '{item}' already exists in '{file_extension}/'. Skipping.")
                 except Exception as e:
                     print(f"  > Error moving '{item}': {e}. Skipping.")
             else:
@@ -1,67 +1,207 @@
+import io
 import os
 import sys
 import re
+import mmap
+import codecs
 import argparse
 from collections import Counter
 from datetime import datetime
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Matches either a timestamp at the start of a (whitespace-stripped) line or
+# a log level keyword anywhere, so a whole file can be scanned in one pass.
+# [^\S\n] is whitespace other than a newline, so a match never spans lines.
+LINE_RE = re.compile(
+    r'^[^\S\n]*\[?(?P<ts>\d{4}-\d{2}-\d{2}[^\S\n]\d{2}:\d{2}:\d{2})'
+    r'|(?P<lvl>ERROR|WARNING|INFO)',
+    re.MULTILINE
+)
+
+# Logs are read (and scanned with LINE_RE) in batches of about this many bytes
+READ_CHUNK_SIZE = 1 << 20
+
+# Files at least this big are scanned with Hyperscan when it is installed
+HYPERSCAN_MIN_SIZE = 1 << 20
+hyperscan_db = None
+
+# UTF-8 encoding of every character str.isspace() accepts except '\n', as
+# Hyperscan scans raw bytes and its own \s only covers ASCII whitespace
+UTF8_SPACE = (
+    rb'(?:[\t\x0b\x0c\r\x1c-\x1f ]|\xc2[\x85\xa0]|\xe1\x9a\x80'
+    rb'|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80)'
+)
+
+# A carriage return that isn't part of a '\r\n' pair
+BARE_CR_RE = re.compile(rb'\r(?!\n)')
+
+def get_hyperscan_db():
+    """
+    Compiles (once) the Hyperscan database equivalent to LINE_RE. Pattern id 0
+    is the timestamp, every other id is a log level keyword.
+    """
+    global hyperscan_db
+    if hyperscan_db is None:
+        patterns = [
+            rb'^' + UTF8_SPACE + rb'*\[?\d{4}-\d{2}-\d{2}' + UTF8_SPACE + rb'\d{2}:\d{2}:\d{2}',
+            b'ERROR',
+            b'WARNING',
+            b'INFO',
+        ]
+        db = hyperscan.Database()
+        db.compile(
+            expressions=patterns,
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_MULTILINE] * len(patterns)
+        )
+        hyperscan_db = db
+    return hyperscan_db
+
+def tally_matches(text, matches):
+    """
+    Turns a stream of (kind, start, end) matches over text into log results.
+
+    kind is 'ts' for a timestamp spanning start:end, or 'lvl' for a log level
+    keyword. A line is counted once, at its highest log level, so further
+    level matches are ignored until the scan moves past the end of that line.
+    text may be str or bytes; the results are of the same type.
+
+    Returns:
+        A tuple of (levels, error_messages, first_timestamp, last_timestamp).
+    """
+    if isinstance(text, str):
+        newline, error_keyword, warning_keyword = '\n', 'ERROR', 'WARNING'
+    else:
+        newline, error_keyword, warning_keyword = b'\n', b'ERROR', b'WARNING'
+
+    levels = []
+    error_messages = []
+    first_timestamp = None
+    last_timestamp = None
+    line_end = -1
+
+    for kind, start, end in matches:
+        if kind == 'ts':
+            current_timestamp = text[start:end]
+            if not first_timestamp:
+                first_timestamp = current_timestamp
+            last_timestamp = current_timestamp
+        elif start > line_end:
+            line_start = text.rfind(newline, 0, start) + 1
+            line_end = text.find(newline, end)
+            if line_end == -1:
+                line_end = len(text)
+
+            error_start = text.find(error_keyword, line_start, line_end)
+            if error_start != -1:
+                levels.append('ERROR')
+                # Extract the error message, assuming it's after the "ERROR" keyword
+                error_messages.append(text[error_start + len(error_keyword):line_end].strip())
+            elif text.find(warning_keyword, line_start, line_end) != -1:
+                levels.append('WARNING')
+            else:
+                levels.append('INFO')
+
+    return levels, error_messages, first_timestamp, last_timestamp
+
+def scan_with_re(text):
+    """
+    Scans decoded log text with LINE_RE.
+    """
+    matches = ((match.lastgroup, *match.span(match.lastgroup)) for match in LINE_RE.finditer(text))
+    return tally_matches(text, matches)
+
+def scan_with_hyperscan(data):
+    """
+    Scans raw UTF-8 log bytes (e.g. a memory map) with Hyperscan, decoding only
+    the timestamps and error messages that are extracted.
+    """
+    matches = []
+
+    def on_match(pattern_id, start, end, flags, context):
+        matches.append(('ts' if pattern_id == 0 else 'lvl', start, end))
+
+    get_hyperscan_db().scan(data, match_event_handler=on_match)
+    levels, error_messages, first_timestamp, last_timestamp = tally_matches(data, matches)
+    # bytes.strip() only removes ASCII whitespace, so strip again once decoded
+    error_messages = [message.decode('utf-8', errors='replace').strip() for message in error_messages]
+    # Timestamp matches start at the line's indent, which can't be excluded
+    # from a Hyperscan match, so it is stripped here along with any '['
+    first_timestamp = first_timestamp.decode('utf-8').lstrip().lstrip('[') if first_timestamp else None
+    last_timestamp = last_timestamp.decode('utf-8').lstrip().lstrip('[') if last_timestamp else None
+    return levels, error_messages, first_timestamp, last_timestamp
+
+def has_bare_cr(data):
+    """
+    Checks whether raw log bytes end any line with a lone '\r'. Reading in
+    text mode treats those as line breaks, but Hyperscan's ^ only follows '\n'.
+    """
+    return data.find(b'\r') != -1 and BARE_CR_RE.search(data) is not None
+
+def scan_stream(text_file):
+    """
+    Scans an open text file with LINE_RE, a batch of whole lines at a time,
+    so the file never has to be held in memory all at once.
+    """
+    levels = []
+    error_messages = []
+    first_timestamp = None
+    last_timestamp = None
+
+    while True:
+        lines = text_file.readlines(READ_CHUNK_SIZE)
+        if not lines:
+            break
+        chunk_levels, chunk_errors, chunk_first, chunk_last = scan_with_re(''.join(lines))
+        levels.extend(chunk_levels)
+        error_messages.extend(chunk_errors)
+        if chunk_first and not first_timestamp:
+            first_timestamp = chunk_first
+        if chunk_last:
+            last_timestamp = chunk_last
+
+    return levels, error_messages, first_timestamp, last_timestamp
+
 def parse_log_file(filepath):
     """
     Parses a single log file to count log levels, find timestamps, and
     identify common error messages.
 
+    Large UTF-8 files are memory-mapped and scanned with Hyperscan when it is
+    installed; everything else goes through the compiled LINE_RE.
+
     Args:
         filepath (str): The path to the log file.
 
     Returns:
         A dictionary with parsing results, or None if the file cannot be processed.
     """
-    # Initialize counts and lists for this file
-    log_counts = {
-        'ERROR': 0,
-        'WARNING': 0,
-        'INFO': 0
-    }
-    error_messages = []
-    first_timestamp = None
-    last_timestamp = None
-    line_number = 0
-
     try:
-        # Try to open the file with utf-8 encoding first
-        try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-        except UnicodeDecodeError:
-            # If that fails, try a more common alternative encoding, like utf-16
-            print(f"  > File '{filepath}' is not UTF-8. Trying with 'utf-16'...")
-            with open(filepath, 'r', encoding='utf-16') as file:
-                lines = file.readlines()
-        
-        for line in lines:
-            line_number += 1
-            line = line.strip()
-            if not line:
-                continue
-
-            # Use a regular expression to find a timestamp at the start of a line
-            timestamp_match = re.match(r'\[?(\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2})\]?', line)
-            if timestamp_match:
-                current_timestamp = timestamp_match.group(1)
-                if not first_timestamp:
-                    first_timestamp = current_timestamp
-                last_timestamp = current_timestamp
-            
-            # Check for log levels
-            if "ERROR" in line:
-                log_counts['ERROR'] += 1
-                # Extract the error message, assuming it's after the "ERROR" keyword
-                error_message = line.split("ERROR", 1)[1].strip()
-                error_messages.append(error_message)
-            elif "WARNING" in line:
-                log_counts['WARNING'] += 1
-            elif "INFO" in line:
-                log_counts['INFO'] += 1
+        with open(filepath, 'rb', buffering=READ_CHUNK_SIZE) as file:
+            # Only UTF-16 logs carry a byte order mark; everything else is
+            # treated as UTF-8
+            is_utf16 = file.peek(2)[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+            size = os.fstat(file.fileno()).st_size
+            scan_result = None
+            if hyperscan is not None and size >= HYPERSCAN_MIN_SIZE and not is_utf16:
+                # UTF-16 logs can't be matched byte-wise, and logs with bare '\r'
+                # line breaks don't split into lines the same way, so both are
+                # left to LINE_RE
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if not has_bare_cr(mm):
+                        scan_result = scan_with_hyperscan(mm)
+            if scan_result is None:
+                if is_utf16:
+                    print(f"  > File '{filepath}' is not UTF-8. Reading it as 'utf-16'...")
+                # Undecodable bytes are replaced rather than aborting the whole file
+                text_file = io.TextIOWrapper(file, encoding='utf-16' if is_utf16 else 'utf-8', errors='replace')
+                scan_result = scan_stream(text_file)
 
     except FileNotFoundError:
         print(f"Error: The file '{filepath}' was not found.")
@@ -73,6 +213,12 @@ def parse_log_file(filepath):
         print(f"An unexpected error occurred while processing '{filepath}': {e}")
         return None
 
+    levels, error_messages, first_timestamp, last_timestamp = scan_result
+
+    # Count all log levels in a single pass
+    log_counts = Counter({'ERROR': 0, 'WARNING': 0, 'INFO': 0})
+    log_counts.update(levels)
+
     # Return the collected data
     return {
         'filepath': filepath,
@@ -3,6 +3,12 @@ import re
 from collections import Counter
 import string
 
+# Removes punctuation so that e.g. "don't" and "dont" count as the same word
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+# A word in the lowercased, punctuation-free text
+WORD_RE = re.compile(r'\w+')
+
 def analyze_text(text):
     """
     Analyzes a string of text to count words, characters, and lines,
@@ -22,15 +28,13 @@ def analyze_text(text):
     line_count = text.count('\n') + 1
 
     # 2. Find the 3 most common words (case-insensitive)
-    # Remove punctuation and convert to lowercase for accurate counting
-    translator = str.maketrans('', '', string.punctuation)
-    clean_text = text.lower().translate(translator)
-    
-    # Split the clean text into a list of words
-    clean_words = re.findall(r'\b\w+\b', clean_text)
-    
-    # Use collections.Counter to find the most common words
-    word_counts = Counter(clean_words)
+    # The whole text is lowercased at once because lowercasing depends on
+    # context (e.g. a final Greek sigma) and can itself produce non-word
+    # characters (e.g. 'İ' becomes 'i' plus a combining dot), so it can't be
+    # done word by word. Words are then counted straight off the scanner
+    # instead of being collected into a list first.
+    clean_text = text.lower().translate(PUNCTUATION_TABLE)
+    word_counts = Counter(match.group(0) for match in WORD_RE.finditer(clean_text))
     most_common = word_counts.most_common(3)
     
     # 3. Display a summary